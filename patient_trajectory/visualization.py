@@ -9,12 +9,6 @@ try:
 except ImportError:
     raise ImportError("pandas is required but not installed. Please install via 'pip install pandas'.")
 
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib.patches as patches
-except ImportError:
-    raise ImportError("Matplotlib is required but not installed. Please install via 'pip install matplotlib'.")
-
 # We'll conditionally import SciPy for spline interpolation
 try:
     from scipy.interpolate import make_interp_spline
@@ -23,7 +17,181 @@ except ImportError:
     HAS_SCIPY = False
     print("Warning: SciPy not found. Curves will be drawn as piecewise lines instead of splines.")
 
-from collections import defaultdict
+# Numba is optional and only imported when use_numba=True is requested
+_age_end_numba = None
+_NAT_INT64 = np.iinfo(np.int64).min
+_NS_PER_DAY = 86_400_000_000_000
+
+# Background box shared by all annotation texts (matplotlib copies it per text)
+_ANNOTATION_BBOX = dict(
+    boxstyle="round,pad=0.3",
+    facecolor="white",
+    edgecolor="none",
+    alpha=0.6
+)
+
+
+def _age_end_kernel(age_starts, start_ns, end_ns):
+    """
+    age_end from int64 nanosecond dates in a single pass (compiled by Numba).
+    """
+    age_ends = np.empty_like(age_starts)
+    for i in range(age_starts.shape[0]):
+        if start_ns[i] == _NAT_INT64 or end_ns[i] == _NAT_INT64:
+            age_ends[i] = age_starts[i]
+        else:
+            dur_days = (end_ns[i] - start_ns[i]) // _NS_PER_DAY
+            age_ends[i] = age_starts[i] + dur_days / 365.0
+    return age_ends
+
+
+def _get_age_end_numba():
+    """
+    Return the JIT-compiled `_age_end_kernel`, or None if Numba isn't installed.
+    """
+    global _age_end_numba
+    if _age_end_numba is None:
+        try:
+            from numba import njit
+        except ImportError:
+            return None
+        _age_end_numba = njit(cache=True)(_age_end_kernel)
+    return _age_end_numba
+
+
+def _import_pyplot():
+    """
+    Import pyplot on first use, so importing the package doesn't pay for
+    matplotlib's initialization (backend selection, font cache).
+    """
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError("Matplotlib is required but not installed. Please install via 'pip install matplotlib'.")
+    return plt
+
+
+def _gather_cluster_colors(cluster_vals, cluster_colors):
+    """
+    RGBA color per episode from its numeric (1-based) cluster, plus the
+    sorted 0-based cluster indices in use. Missing, non-numeric and
+    out-of-range clusters are gray.
+    """
+    from matplotlib.colors import to_rgba_array
+
+    # The palette's last entry is the gray fallback
+    palette = to_rgba_array(list(cluster_colors) + ["gray"])
+    has_cluster = np.isfinite(cluster_vals)
+    cluster_idxs = np.where(has_cluster, np.trunc(cluster_vals), 0).astype(np.int64) - 1
+    in_palette = has_cluster & (cluster_idxs >= 0) & (cluster_idxs < len(cluster_colors))
+    cluster_idxs = np.where(in_palette, cluster_idxs, len(cluster_colors))
+    return palette[cluster_idxs], np.unique(cluster_idxs[in_palette])
+
+
+def _add_cluster_legend(ax, used_clusters, cluster_colors, fontsize):
+    """
+    Add the "Clusters" legend for `used_clusters` (0-based) to `ax`.
+    """
+    from matplotlib.lines import Line2D
+    legend_elems = []
+    for c_idx in used_clusters:
+        c_label = f"Cluster {c_idx+1}"
+        c_color = cluster_colors[c_idx]
+        legend_elems.append(
+            Line2D([0], [0],
+                   color=c_color,
+                   marker='s', markersize=5,
+                   linewidth=2, label=c_label, alpha=0.7)
+        )
+    ax.legend(
+        handles=legend_elems,
+        title="Clusters",
+        fontsize=fontsize,
+        title_fontsize=fontsize,
+        loc='upper left',
+        bbox_to_anchor=(1.05, 1)
+    )
+
+
+def _is_sorted_episodes(df, pasient_col):
+    """
+    True if sorting `df` by patient, then 'age_start', with a reset index
+    would leave it unchanged. Cheap checks run first, so unsorted input is
+    usually rejected after looking at only a few rows.
+    """
+    index = df.index
+    if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+        return False
+    patients = df[pasient_col]
+    # Stops at the first out-of-order id; False if any id is missing
+    if not patients.is_monotonic_increasing:
+        return False
+    if not pd.api.types.is_numeric_dtype(df["age_start"]):
+        return False
+    ages = df["age_start"].to_numpy(dtype=float)
+    # Missing ages are sorted last; leave those frames to sort_values
+    if np.isnan(ages).any():
+        return False
+    ids = patients.to_numpy()
+    same_patient = ids[1:] == ids[:-1]
+    return bool(np.all(~same_patient | (np.diff(ages) >= 0)))
+
+
+def _parse_dates(values, date_format):
+    """
+    Parse `values` to datetimes using `date_format`, falling back once to
+    pandas' format inference if any non-missing value does not match.
+    """
+    parsed = pd.to_datetime(values, format=date_format, errors="coerce")
+    if date_format is not None and (parsed.isna() & values.notna()).any():
+        parsed = pd.to_datetime(values, errors="coerce")
+    return parsed
+
+
+def _join_nonempty(parts, sep):
+    """
+    Element-wise join of string Series with `sep`, skipping empty strings.
+    """
+    joined = parts[0]
+    for part in parts[1:]:
+        both = (joined != "") & (part != "")
+        joined = (joined + sep + part).where(both, joined + part)
+    return joined
+
+
+def _format_annotations(df, annotation_cols):
+    """
+    Build the annotation text for every row of `df` at once.
+
+    The first 2 columns go on line 1 and the rest on line 2, each entry as
+    "col: value"; missing values and columns are skipped. Rows without any
+    line-1 entries get an empty string.
+    """
+    empty = pd.Series("", index=df.index)
+    line1_parts = [empty]
+    line2_parts = [empty]
+    for i, col in enumerate(annotation_cols):
+        if col not in df.columns:
+            continue
+        column = df[col]
+        if pd.api.types.is_datetime64_any_dtype(column) or pd.api.types.is_timedelta64_dtype(column):
+            # str(Timestamp)/str(Timedelta) keep the time part, e.g. "2021-09-06 00:00:00"
+            values = column.map(str)
+        elif isinstance(column.dtype, np.dtype) and column.dtype.kind == "f" and column.dtype != np.float64:
+            # Formatted as the float64 they become when read row by row
+            values = column.astype(np.float64).astype(str)
+        else:
+            values = column.astype(str)
+        entry = (f"{col}: " + values).where(df[col].notna(), "")
+        if i < 2:
+            line1_parts.append(entry)
+        else:
+            line2_parts.append(entry)
+
+    line1 = _join_nonempty(line1_parts, ", ")
+    line2 = _join_nonempty(line2_parts, ", ")
+    text = (line1 + "\n" + line2).where((line1 != "") & (line2 != ""), line1)
+    return text.to_numpy(dtype=object)
 
 class PatientTrajectoryVisualizer:
     """
@@ -52,16 +220,55 @@ class PatientTrajectoryVisualizer:
         cluster_col="cluster",
         start_date_col="episode_start_date",
         end_date_col="episode_end_date",
+        date_format="%Y-%m-%d",
+        use_numba=False,
+        copy=False,
+        sort_episodes=True,
         # The user can store more defaults here if needed
     ):
         """
         Initialize the visualizer with a DataFrame and basic column mappings.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            One row per episode. Must contain an 'age' column and `pasient_col`.
+        pasient_col : str
+            Column identifying the patient.
+        cluster_col : str
+            Column with the (1-based) cluster of each episode.
+        start_date_col, end_date_col : str
+            Columns with the episode start and end dates.
+        date_format : str or None
+            strftime format used to parse non-datetime date columns. Parsing
+            with an explicit format is much faster than letting pandas infer
+            it per value; if some values don't match, the column is parsed
+            again with inference. None always infers.
+        use_numba : bool
+            Compute episode end ages with a fused Numba kernel instead of
+            NumPy/pandas array operations. Only worth it for very large
+            cohorts; falls back to the default path if Numba isn't installed.
+        copy : bool
+            If True, work on a copy of `df` and leave the caller's DataFrame
+            untouched. By default `df` is prepared in place (date columns
+            converted, 'age_start'/'age_end' added, rows sorted), which avoids
+            a full copy of the frame.
+        sort_episodes : bool
+            Sort rows by patient, then by 'age_start'. Pass False to skip the
+            sort when `df` is already in the order it should be plotted in;
+            rows are then drawn bottom-to-top in frame order. Separator lines
+            are drawn between consecutive rows of different patients, so each
+            patient's episodes should be contiguous.
         """
-        self.df = df
+        self.df = df.copy() if copy else df
         self.pasient_col = pasient_col
         self.cluster_col = cluster_col
         self.start_date_col = start_date_col
         self.end_date_col = end_date_col
+        self.date_format = date_format
+
+        # Bars and styling of the most recent plot_gantt figure, for update_colors()
+        self._last_plot = None
 
         # Basic validity checks
         if "age" not in df.columns:
@@ -70,26 +277,102 @@ class PatientTrajectoryVisualizer:
             raise ValueError(f"DataFrame missing required column: {pasient_col}")
 
         # Make sure date columns are datetime
-        if not np.issubdtype(df[start_date_col].dtype, np.datetime64):
-            self.df[start_date_col] = pd.to_datetime(df[start_date_col], errors="coerce")
-        if not np.issubdtype(df[end_date_col].dtype, np.datetime64):
-            self.df[end_date_col] = pd.to_datetime(df[end_date_col], errors="coerce")
+        for date_col in (start_date_col, end_date_col):
+            if not pd.api.types.is_datetime64_any_dtype(self.df[date_col]):
+                self.df[date_col] = _parse_dates(self.df[date_col], date_format)
 
         # Compute age_start => from the "age" column
         self.df["age_start"] = self.df["age"]
 
         # Compute age_end => from the date difference (fallback = same as start)
-        def compute_age_end(row):
-            if pd.notnull(row[self.end_date_col]) and pd.notnull(row[self.start_date_col]):
-                dur_days = (row[self.end_date_col] - row[self.start_date_col]).days
-                return row["age_start"] + dur_days / 365.0
-            else:
-                return row["age_start"]
+        age_end_numba = _get_age_end_numba() if use_numba else None
+        if use_numba and age_end_numba is None:
+            print("Warning: Numba not found. Falling back to NumPy for episode end ages.")
+        if age_end_numba is not None:
+            self.df["age_end"] = age_end_numba(
+                self.df["age_start"].to_numpy(dtype=np.float64),
+                self.df[start_date_col].to_numpy(dtype="datetime64[ns]").view(np.int64),
+                self.df[end_date_col].to_numpy(dtype="datetime64[ns]").view(np.int64)
+            )
+        else:
+            # A single timedelta64 subtraction over the columns; rows missing
+            # either date (one notna() mask per column) keep age_start
+            has_dates = self.df[start_date_col].notna() & self.df[end_date_col].notna()
+            dur_days = (self.df[end_date_col] - self.df[start_date_col]).dt.days
+            self.df["age_end"] = (self.df["age_start"] + dur_days / 365.0).where(has_dates, self.df["age_start"])
+
+        # Sort by patient, then by age_start (skipped if already in that order)
+        if sort_episodes and not _is_sorted_episodes(self.df, pasient_col):
+            self.df.sort_values(by=[pasient_col, "age_start"], inplace=True, ignore_index=True)
+
+    def update_colors(self, cluster_col=None, cluster_colors=None):
+        """
+        Recolor the bars of the most recent `plot_gantt` figure in place.
+
+        Only the bar colors (and the cluster legend, if it was requested) are
+        updated before asking the canvas for a redraw, which is much cheaper
+        than building the whole figure again.
+
+        Parameters
+        ----------
+        cluster_col : str, optional
+            Column to color the episodes by. Defaults to `self.cluster_col`.
+        cluster_colors : list of str, optional
+            List of colors for cluster indices (1-based). Defaults to the
+            colors used by the last plot.
+
+        Returns
+        -------
+        (fig, ax) : (matplotlib.figure.Figure, matplotlib.axes._axes.Axes)
+        """
+        if self._last_plot is None:
+            raise RuntimeError("update_colors() requires a figure from plot_gantt() first.")
+
+        bars = self._last_plot["bars"]
+        ax = bars.axes
+        if len(bars.get_paths()) != len(self.df):
+            raise ValueError("DataFrame no longer matches the plotted episodes; call plot_gantt() again.")
+
+        if cluster_col is None:
+            cluster_col = self.cluster_col
+        if cluster_colors is None:
+            cluster_colors = self._last_plot["cluster_colors"]
+
+        # Read the column fresh: recoloring after new labels were written into
+        # it is the main use of this method
+        cluster_vals = self._cluster_values(cluster_col)
+        bar_colors, used_clusters = _gather_cluster_colors(cluster_vals, cluster_colors)
+        bars.set_facecolor(bar_colors)
 
-        self.df["age_end"] = self.df.apply(compute_age_end, axis=1)
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if self._last_plot["add_cluster_legend"] and len(used_clusters) > 0:
+            _add_cluster_legend(ax, used_clusters, cluster_colors, self._last_plot["axis_fontsize"])
+        self._last_plot["cluster_colors"] = cluster_colors
 
-        # Sort by patient, then by age_start
-        self.df.sort_values(by=[pasient_col, "age_start"], inplace=True, ignore_index=True)
+        ax.figure.canvas.draw_idle()
+        return ax.figure, ax
+
+    def _episode_arrays(self, pasient_col):
+        """
+        Patient ids, bar starts and bar widths (minimum 0.5) as NumPy arrays.
+        """
+        df = self.df
+        patient_ids = df[pasient_col].to_numpy()
+        age_starts = df["age_start"].to_numpy(dtype=float)
+        widths = df["age_end"].to_numpy(dtype=float) - age_starts
+        widths = np.where(widths <= 0, 0.5, widths)
+        return patient_ids, age_starts, widths
+
+    def _cluster_values(self, cluster_col):
+        """
+        Numeric cluster of each episode; NaN where missing or non-numeric.
+        """
+        df = self.df
+        if cluster_col in df.columns:
+            return pd.to_numeric(df[cluster_col], errors="coerce").to_numpy(dtype=float)
+        return np.full(len(df), np.nan)
 
     def plot_gantt(
         self,
@@ -107,7 +390,10 @@ class PatientTrajectoryVisualizer:
         curve_color="black",
         curve_linestyle="--",
         curve_linewidth=2.0,
-        title="Patient Episodes Trajectory"
+        title="Patient Episodes Trajectory",
+        rasterize_threshold=5000,
+        max_ytick_labels=200,
+        annotate_first_only=False
     ):
         """
         Plot the Gantt chart for patient episodes.
@@ -144,6 +430,16 @@ class PatientTrajectoryVisualizer:
             Width for the connecting line.
         title : str
             Title of the plot.
+        rasterize_threshold : int or None
+            With more episodes than this, the bars are rasterized when saving
+            to vector formats (PDF/SVG), which keeps file size and save time
+            down. Axes, labels and annotation text stay vector. None disables it.
+        max_ytick_labels : int or None
+            Maximum number of episode labels on the y-axis. With more episodes,
+            only every k-th episode is labelled. None labels every episode.
+        annotate_first_only : bool
+            Only annotate each patient's first (lowest) episode, which keeps
+            the number of text artists at one per patient for dense cohorts.
 
         Returns
         -------
@@ -167,170 +463,133 @@ class PatientTrajectoryVisualizer:
                 "yellow", "pink", "olive", "teal"
             ]
 
+        plt = _import_pyplot()
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.ticker import FixedFormatter, FixedLocator
+
         # Create figure and axes
         fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
 
-        current_y = 0.0
-        y_ticks = []
-        y_tick_labels = []
-        used_clusters = set()
-
-        all_age_starts = []
-        all_age_ends = []
-
-        patient_centers = defaultdict(list)
-
-        # Plot each row
+        # Extract the columns we need once, as NumPy arrays, instead of
+        # materializing a Series per row inside the plotting loop.
         num_rows = len(df)
-        for idx in range(num_rows):
-            row = df.iloc[idx]
-            patient_id = row[pasient_col]
-            age_start = row["age_start"]
-            age_end = row["age_end"]
-
-            # Ensure minimal width
-            width = age_end - age_start
-            if width <= 0:
-                width = 0.5
-
-            all_age_starts.append(age_start)
-            all_age_ends.append(age_start + width)
-
-            # Cluster color
-            cluster_val = row.get(cluster_col, np.nan)
-            if pd.notnull(cluster_val):
-                try:
-                    cluster_idx = int(cluster_val) - 1
-                except (ValueError, TypeError):
-                    cluster_idx = -1
-            else:
-                cluster_idx = -1
-
-            color = cluster_colors[cluster_idx] if 0 <= cluster_idx < len(cluster_colors) else "gray"
-            if cluster_idx >= 0:
-                used_clusters.add(cluster_idx)
-
-            # Draw rectangle
-            rect = patches.Rectangle(
-                (age_start, current_y),
-                width,
-                row_height,
-                facecolor=color,
-                edgecolor="black",
-                alpha=0.7
+        patient_ids, age_starts, widths = self._episode_arrays(pasient_col)
+
+        # Row positions per patient come from one groupby pass; they are already
+        # in ascending (i.e. bottom-to-top) order.
+        patient_rows = df.groupby(pasient_col, sort=False).indices
+        cluster_vals = self._cluster_values(cluster_col)
+        annotations = _format_annotations(df, annotation_cols)
+
+        # Bar geometry: row i sits at i * (row_height + row_gap)
+        row_step = row_height + row_gap
+        bottoms = np.arange(num_rows) * row_step
+        center_xs = age_starts + widths / 2.0
+        center_ys = bottoms + row_height / 2.0
+        current_y = num_rows * row_step
+
+        # Cluster color: gathered from a palette, gray for missing/out-of-range
+        bar_colors, used_clusters = _gather_cluster_colors(cluster_vals, cluster_colors)
+
+        # Place text, visiting only the rows that actually have an annotation.
+        # Positions are computed as arrays and converted to Python floats in one go.
+        annotated = np.flatnonzero(annotations != "")
+        if annotate_first_only:
+            first_rows = [rows[0] for rows in patient_rows.values()]
+            annotated = np.intersect1d(annotated, first_rows)
+        text_xs = (center_xs[annotated] + 0.5).tolist()
+        text_ys = center_ys[annotated].tolist()
+        for text_x, text_y, text in zip(text_xs, text_ys, annotations[annotated]):
+            ax.text(
+                text_x,
+                text_y,
+                text,
+                ha="left",
+                va="center",
+                fontsize=annotation_fontsize,
+                color="black",
+                bbox=_ANNOTATION_BBOX
             )
-            ax.add_patch(rect)
-
-            # Center of bar
-            center_x = age_start + width / 2.0
-            center_y = current_y + row_height / 2.0
-            patient_centers[patient_id].append((center_x, center_y))
-
-            # Build annotation text (2 lines: first 2 columns => line1, rest => line2)
-            line1_parts = []
-            line2_parts = []
-            for i, col in enumerate(annotation_cols):
-                val = row.get(col, None)
-                if pd.notnull(val):
-                    entry = f"{col}: {val}"
-                    if i < 2:
-                        line1_parts.append(entry)
-                    else:
-                        line2_parts.append(entry)
-
-            line1 = ", ".join(line1_parts)
-            line2 = ", ".join(line2_parts)
-            if line1 and line2:
-                annotation_text = f"{line1}\n{line2}"
-            elif line1:
-                annotation_text = line1
-            else:
-                annotation_text = ""
-
-            # Place text
-            if annotation_text.strip():
-                ax.text(
-                    center_x + 0.5,
-                    center_y,
-                    annotation_text,
-                    ha="left",
-                    va="center",
-                    fontsize=annotation_fontsize,
-                    color="black",
-                    bbox=dict(
-                        boxstyle="round,pad=0.3",
-                        facecolor="white",
-                        edgecolor="none",
-                        alpha=0.6
-                    )
-                )
-
-            # Y-label
-            episode_label = f"Pat {patient_id}, E{idx+1}"
-            y_ticks.append(center_y)
-            y_tick_labels.append(episode_label)
-
-            # Advance
-            current_y += (row_height + row_gap)
-
-            # Dotted line if next row is a new patient
-            if idx < (num_rows - 1):
-                next_patient_id = df.iloc[idx+1][pasient_col]
-                if next_patient_id != patient_id:
-                    ax.axhline(
-                        y=current_y,
-                        color='gray',
-                        linestyle=':',
-                        linewidth=1.0,
-                        alpha=0.8
-                    )
-
-        # Connect episodes (spline if SciPy, else piecewise)
-        if HAS_SCIPY:
-            for pid, centers in patient_centers.items():
-                if len(centers) < 2:
-                    continue
-                centers_sorted = sorted(centers, key=lambda c: c[1])
-                xs = [c[0] for c in centers_sorted]
-                ys = [c[1] for c in centers_sorted]
-                if len(xs) < 2:
-                    continue
+
+        # Draw all bars as a single collection rather than one patch per row
+        lefts = age_starts
+        rights = age_starts + widths
+        tops = bottoms + row_height
+        bar_verts = np.stack([
+            np.column_stack([lefts, bottoms]),
+            np.column_stack([lefts, tops]),
+            np.column_stack([rights, tops]),
+            np.column_stack([rights, bottoms]),
+        ], axis=1)
+        bars = PolyCollection(
+            bar_verts,
+            facecolors=bar_colors,
+            edgecolors="black",
+            alpha=0.7
+        )
+        if rasterize_threshold is not None and num_rows > rasterize_threshold:
+            bars.set_rasterized(True)
+        ax.add_collection(bars, autolim=False)
+
+        # Y-labels; with many episodes only every k-th row gets one
+        if max_ytick_labels and num_rows > max_ytick_labels:
+            tick_step = int(np.ceil(num_rows / max_ytick_labels))
+        else:
+            tick_step = 1
+        tick_rows = np.arange(0, num_rows, tick_step)
+        y_tick_labels = [
+            f"Pat {patient_ids[idx]}, E{idx+1}"
+            for idx in tick_rows
+        ]
+
+        # Dotted line wherever the next row belongs to a new patient.
+        # x is in axes coordinates so the lines span the full width, like axhline.
+        boundaries = (np.flatnonzero(patient_ids[1:] != patient_ids[:-1]) + 1) * row_step
+        if len(boundaries) > 0:
+            separators = LineCollection(
+                [[(0, y), (1, y)] for y in boundaries],
+                colors='gray',
+                linestyles=':',
+                linewidths=1.0,
+                alpha=0.8,
+                transform=ax.get_yaxis_transform()
+            )
+            ax.add_collection(separators, autolim=False)
+
+        # Connect episodes (spline if SciPy, else piecewise), all in one collection
+        curves = []
+        for rows in patient_rows.values():
+            if len(rows) < 2:
+                continue
+            xs = center_xs[rows]
+            ys = center_ys[rows]
+            if HAS_SCIPY:
                 k_spline = min(3, len(xs) - 1)
-                if k_spline < 1:
-                    continue
                 y_new = np.linspace(ys[0], ys[-1], 150)
                 spline = make_interp_spline(ys, xs, k=k_spline)
-                x_smooth = spline(y_new)
-                ax.plot(
-                    x_smooth, y_new,
-                    color=curve_color,
-                    linestyle=curve_linestyle,
-                    linewidth=curve_linewidth,
-                    alpha=0.8
-                )
-        else:
-            # piecewise fallback
-            for pid, centers in patient_centers.items():
-                if len(centers) < 2:
-                    continue
-                centers_sorted = sorted(centers, key=lambda c: c[1])
-                xs = [c[0] for c in centers_sorted]
-                ys = [c[1] for c in centers_sorted]
-                ax.plot(
-                    xs, ys,
-                    color=curve_color,
-                    linestyle=curve_linestyle,
-                    linewidth=curve_linewidth,
-                    alpha=0.8
-                )
+                curves.append(np.column_stack([spline(y_new), y_new]))
+            else:
+                # piecewise fallback
+                curves.append(np.column_stack([xs, ys]))
+
+        if curves:
+            connectors = LineCollection(
+                curves,
+                colors=curve_color,
+                linestyles=curve_linestyle,
+                linewidths=curve_linewidth,
+                alpha=0.8
+            )
+            ax.add_collection(connectors, autolim=False)
 
         # Configure axes
-        ax.set_yticks(y_ticks)
-        ax.set_yticklabels(y_tick_labels, fontsize=axis_fontsize)
+        ax.yaxis.set_major_locator(FixedLocator(center_ys[tick_rows]))
+        ax.yaxis.set_major_formatter(FixedFormatter(y_tick_labels))
+        ax.tick_params(axis="y", labelsize=axis_fontsize)
 
-        if all_age_starts and all_age_ends:
-            age_min = min(all_age_starts)
-            age_max = max(all_age_ends)
+        if num_rows > 0:
+            age_min = np.nanmin(age_starts)
+            age_max = np.nanmax(age_starts + widths)
             ax.set_xlim(age_min - 0.5, age_max + 0.5)
         else:
             ax.set_xlim(0, 1)
@@ -344,28 +603,18 @@ class PatientTrajectoryVisualizer:
 
         # Optional cluster legend
         if add_cluster_legend and len(used_clusters) > 0:
-            from matplotlib.lines import Line2D
-            legend_elems = []
-            for c_idx in sorted(used_clusters):
-                c_label = f"Cluster {c_idx+1}"
-                c_color = cluster_colors[c_idx]
-                legend_elems.append(
-                    Line2D([0], [0],
-                           color=c_color,
-                           marker='s', markersize=5,
-                           linewidth=2, label=c_label, alpha=0.7)
-                )
-            ax.legend(
-                handles=legend_elems,
-                title="Clusters",
-                fontsize=axis_fontsize,
-                title_fontsize=axis_fontsize,
-                loc='upper left',
-                bbox_to_anchor=(1.05, 1)
-            )
+            _add_cluster_legend(ax, used_clusters, cluster_colors, axis_fontsize)
 
         fig.tight_layout()
 
+        # Keep what update_colors() needs to recolor this figure in place
+        self._last_plot = {
+            "bars": bars,
+            "cluster_colors": cluster_colors,
+            "add_cluster_legend": add_cluster_legend,
+            "axis_fontsize": axis_fontsize,
+        }
+
         # Save if requested
         if save_path:
             fig.savefig(save_path, dpi=dpi, bbox_inches="tight")
@@ -20,6 +20,9 @@ setuptools.setup(
         "matplotlib",
         # "scipy" if you want to require advanced curves
     ],
+    extras_require={
+        "numba": ["numba"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -1,10 +1,27 @@
 
 import pytest
+import numpy as np
 import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 
 from patient_trajectory.visualization import PatientTrajectoryVisualizer
 
 
+def _episodes_df(**columns):
+    """
+    Two patients with three episodes, plus `columns` (added or overriding).
+    """
+    data = {
+        "pasient": [1, 1, 2],
+        "episode_start_date": ["2020-01-01", "2020-03-01", "2021-01-15"],
+        "episode_end_date":   ["2020-02-01", "2020-04-01", "2021-02-15"],
+        "age": [10, 11, 50],
+    }
+    data.update(columns)
+    return pd.DataFrame(data)
+
+
 def test_patient_trajectory_visualizer():
     # A small DataFrame for testing
     df = pd.DataFrame({
@@ -50,3 +67,224 @@ def test_patient_trajectory_visualizer():
 
     # Cleanup
     # (Matplotlib auto-closes but you could do plt.close(fig) if needed)
+
+
+def test_episodes_drawn_as_collections():
+    df = _episodes_df(cluster=[1, 2, 1])
+
+    viz = PatientTrajectoryVisualizer(df=df)
+    fig, ax = viz.plot_gantt()
+
+    # One bar per episode, all in a single collection instead of one patch each
+    assert len(ax.patches) == 0
+    bars = ax.collections[0]
+    assert len(bars.get_paths()) == len(df)
+
+    # Patient separator and connecting curve are collections too
+    assert len(ax.lines) == 0
+    assert len(ax.collections) == 3
+    assert not bars.get_rasterized()
+    plt.close(fig)
+
+    # Large plots rasterize the bars for vector output
+    fig, ax = viz.plot_gantt(rasterize_threshold=2)
+    assert ax.collections[0].get_rasterized()
+    plt.close(fig)
+
+
+def test_missing_and_out_of_range_clusters_are_gray():
+    df = pd.DataFrame({
+        "pasient": [1, 1, 2, 3],
+        "episode_start_date": ["2020-01-01", "2020-03-01", "2021-01-15", "2021-05-01"],
+        "episode_end_date":   ["2020-02-01", "2020-04-01", "2021-02-15", "2021-06-01"],
+        "age": [10, 11, 50, 30],
+        "cluster": [1, None, 99, 2],
+    })
+
+    viz = PatientTrajectoryVisualizer(df=df)
+    fig, ax = viz.plot_gantt(cluster_colors=["red", "green"])
+
+    gray = to_rgba("gray", alpha=0.7)
+    facecolors = [tuple(c) for c in ax.collections[0].get_facecolors()]
+    assert facecolors == [to_rgba("red", alpha=0.7), gray, gray, to_rgba("green", alpha=0.7)]
+
+    # Only clusters that map onto the palette show up in the legend
+    legend_labels = [t.get_text() for t in ax.get_legend().get_texts()]
+    assert legend_labels == ["Cluster 1", "Cluster 2"]
+
+    plt.close(fig)
+
+
+def test_date_format_and_fallback():
+    df = pd.DataFrame({
+        "pasient": [1, 2],
+        "episode_start_date": ["01.01.2020", "15.01.2021"],
+        "episode_end_date":   ["01.02.2020", None],
+        "age": [10, 50],
+    })
+    viz = PatientTrajectoryVisualizer(df=df, date_format="%d.%m.%Y")
+    assert list(viz.df["episode_start_date"]) == [pd.Timestamp("2020-01-01"), pd.Timestamp("2021-01-15")]
+    assert pd.isna(viz.df["episode_end_date"].iloc[1])
+
+    # Values not matching the default ISO format are parsed by inference instead
+    df = pd.DataFrame({
+        "pasient": [1, 2],
+        "episode_start_date": ["2020/01/01", "2021/01/15"],
+        "episode_end_date":   ["2020/02/01", "2021/02/15"],
+        "age": [10, 50],
+    })
+    viz = PatientTrajectoryVisualizer(df=df)
+    assert list(viz.df["episode_start_date"]) == [pd.Timestamp("2020-01-01"), pd.Timestamp("2021-01-15")]
+
+
+def test_age_end_from_episode_duration():
+    df = _episodes_df(episode_end_date=["2020-12-31", None, "2021-01-14"])
+    viz = PatientTrajectoryVisualizer(df=df)
+
+    # 365 days => +1 year; missing end date => same as start; negative durations are kept
+    assert list(viz.df["age_end"]) == pytest.approx([11.0, 11.0, 50 - 1 / 365.0])
+
+
+def test_replot_after_overwriting_columns():
+    df = _episodes_df(cluster=[1, 1, 1], dx=["a", "b", "c"])
+    viz = PatientTrajectoryVisualizer(df=df)
+    fig, ax = viz.plot_gantt(annotation_cols=["dx"])
+    plt.close(fig)
+
+    # viz.df is the caller's frame; reassigned columns show up in the next plot
+    df["cluster"] = [2, 2, 2]
+    df["dx"] = ["X", "Y", "Z"]
+    fig, ax = viz.plot_gantt(annotation_cols=["dx"])
+    facecolors = [tuple(c) for c in ax.collections[0].get_facecolors()]
+    assert facecolors == [to_rgba("green", alpha=0.7)] * 3
+    assert [t.get_text() for t in ax.texts] == ["dx: X", "dx: Y", "dx: Z"]
+    plt.close(fig)
+
+
+def test_numba_age_end_matches_default():
+    pytest.importorskip("numba")
+    df = pd.DataFrame({
+        "pasient": [1, 1, 2, 3],
+        "episode_start_date": ["2020-01-01", "2020-03-01", "2021-01-15", None],
+        "episode_end_date":   ["2020-12-31", None, "2021-01-14", "2021-03-01"],
+        "age": [10, 11, 50, 30],
+    })
+    expected = PatientTrajectoryVisualizer(df=df.copy())
+    viz = PatientTrajectoryVisualizer(df=df.copy(), use_numba=True)
+
+    assert list(viz.df["age_end"]) == pytest.approx(list(expected.df["age_end"]))
+
+
+def test_copy_leaves_input_untouched():
+    df = pd.DataFrame({
+        "pasient": [2, 1],
+        "episode_start_date": ["2021-01-15", "2020-01-01"],
+        "episode_end_date":   ["2021-02-15", "2020-02-01"],
+        "age": [50, 10],
+    })
+    original = df.copy()
+
+    viz = PatientTrajectoryVisualizer(df=df, copy=True)
+    pd.testing.assert_frame_equal(df, original)
+    assert list(viz.df["pasient"]) == [1, 2]
+
+    # Frame order is kept when sorting is switched off
+    viz = PatientTrajectoryVisualizer(df=df, copy=True, sort_episodes=False)
+    assert list(viz.df["pasient"]) == [2, 1]
+
+    # Default: prepared in place, no copy
+    viz = PatientTrajectoryVisualizer(df=df)
+    assert viz.df is df
+    assert "age_end" in df.columns
+    assert df["pasient"].dtype == original["pasient"].dtype
+
+
+def test_ytick_labels_are_thinned_out():
+    df = _episodes_df()
+    viz = PatientTrajectoryVisualizer(df=df)
+
+    fig, ax = viz.plot_gantt()
+    assert [t.get_text() for t in ax.get_yticklabels()] == ["Pat 1, E1", "Pat 1, E2", "Pat 2, E3"]
+    plt.close(fig)
+
+    fig, ax = viz.plot_gantt(max_ytick_labels=2)
+    assert [t.get_text() for t in ax.get_yticklabels()] == ["Pat 1, E1", "Pat 2, E3"]
+    plt.close(fig)
+
+
+def test_annotate_first_only():
+    df = _episodes_df(diagnosis=["Flu", "Cold", "Check-up"])
+    viz = PatientTrajectoryVisualizer(df=df)
+
+    fig, ax = viz.plot_gantt(annotation_cols=["diagnosis"], annotate_first_only=True)
+    assert [t.get_text() for t in ax.texts] == ["diagnosis: Flu", "diagnosis: Check-up"]
+    plt.close(fig)
+
+
+def test_update_colors_reuses_figure():
+    df = _episodes_df(cluster=[1, 2, 1], risk_group=[2, 2, None])
+    viz = PatientTrajectoryVisualizer(df=df)
+
+    with pytest.raises(RuntimeError):
+        viz.update_colors()
+
+    fig, ax = viz.plot_gantt(cluster_colors=["red", "green"])
+    bars = ax.collections[0]
+
+    new_fig, new_ax = viz.update_colors(cluster_col="risk_group")
+    assert new_fig is fig and new_ax is ax
+    assert ax.collections[0] is bars
+
+    facecolors = [tuple(c) for c in bars.get_facecolors()]
+    assert facecolors == [to_rgba("green", alpha=0.7), to_rgba("green", alpha=0.7), to_rgba("gray", alpha=0.7)]
+    assert [t.get_text() for t in ax.get_legend().get_texts()] == ["Cluster 2"]
+
+    # New labels written into the plotted column are picked up
+    df["cluster"] = [2, 2, 2]
+    viz.update_colors()
+    facecolors = [tuple(c) for c in bars.get_facecolors()]
+    assert facecolors == [to_rgba("green", alpha=0.7)] * 3
+
+    plt.close(fig)
+
+
+def test_annotation_text_layout():
+    df = _episodes_df(
+        diagnosis=["Flu", None, None],
+        medication=[None, "MedA", None],
+        insurance=["Public", None, "Private"],
+        stay=pd.to_timedelta(["1D", None, "2D"]),
+        dose=np.array([0.1, np.nan, 0.5], dtype=np.float32),
+    )
+    viz = PatientTrajectoryVisualizer(df=df)
+
+    fig, ax = viz.plot_gantt(
+        annotation_cols=["diagnosis", "medication", "episode_start_date", "insurance", "stay", "dose"]
+    )
+
+    # First 2 columns on line 1, the rest on line 2; missing values are skipped,
+    # and a row with nothing on line 1 gets no annotation at all. Dates and
+    # durations keep their time part, as str() of the scalar gives it.
+    assert [t.get_text() for t in ax.texts] == [
+        "diagnosis: Flu\nepisode_start_date: 2020-01-01 00:00:00, insurance: Public, "
+        "stay: 1 days 00:00:00, dose: 0.10000000149011612",
+        "medication: MedA\nepisode_start_date: 2020-03-01 00:00:00",
+    ]
+    plt.close(fig)
+
+
+def test_sorted_input_skips_the_sort(monkeypatch):
+    # Reference: the same episodes in reverse order go through sort_values
+    unsorted = _episodes_df().iloc[::-1].reset_index(drop=True)
+    expected = PatientTrajectoryVisualizer(df=unsorted).df
+
+    def no_sort(*args, **kwargs):
+        raise AssertionError("sort_values called on already sorted episodes")
+
+    monkeypatch.setattr(pd.DataFrame, "sort_values", no_sort)
+    viz = PatientTrajectoryVisualizer(df=_episodes_df())
+    pd.testing.assert_frame_equal(viz.df, expected)
+
+    # Out of order within a patient still needs the sort
+    with pytest.raises(AssertionError, match="sort_values called"):
+        PatientTrajectoryVisualizer(df=_episodes_df(age=[11, 10, 50]))